@@ -34,6 +34,7 @@ from app.schemas.response import (
     TicketListResponse,
     TicketResponse,
 )
+from app.services.ai_classifier import BaseClassifier, get_classifier
 from app.services.ticket_service import TicketService
 
 # API router configuration with common prefix and tags
@@ -50,6 +51,7 @@ router = APIRouter(prefix="/requests", tags=["requests"])
 async def create_request(
     request: TicketCreateRequest,
     db: AsyncSession = Depends(get_db),
+    classifier: BaseClassifier = Depends(get_classifier),
 ) -> TicketCreateResponse:
     """
     Create a new customer support ticket with AI classification.
@@ -73,6 +75,7 @@ async def create_request(
         request: Ticket creation request containing customer information
             and support request details.
         db: Database session dependency for data persistence.
+        classifier: AI classifier dependency used to categorize the ticket.
 
     Returns:
         TicketCreateResponse: Confirmation response with ticket ID and
@@ -85,13 +88,12 @@ async def create_request(
     Example:
         POST /api/v1/requests/
         {
-            "customer_email": "user@example.com",
             "subject": "Login Issues",
-            "body": "I can't log into my account"
+            "body": "I can't log into my account since this morning"
         }
     """
-    # Initialize ticket service with database session
-    service = TicketService(db)
+    # Initialize ticket service with database session and classifier
+    service = TicketService(db, classifier)
 
     try:
         # Create and classify the ticket
@@ -18,10 +18,10 @@ Author: Customer Support Intelligence Team
 Version: 1.0.0
 """
 
-from typing import List, Optional, Union
+from typing import List, Literal, Optional, Union
 from functools import lru_cache
 
-from pydantic import AnyHttpUrl, PostgresDsn, field_validator
+from pydantic import AliasChoices, AnyHttpUrl, Field, PostgresDsn, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -112,6 +112,11 @@ class Settings(BaseSettings):
     ai_model: str = "gpt-4o"  # AI model identifier
     ai_temperature: float = 0.3  # AI response randomness (0.0-1.0)
     ai_max_tokens: int = 150  # Maximum AI response tokens
+    # Classifier backend: "auto" uses OpenAI when a key is configured,
+    # "dummy" forces the keyword classifier (e.g. for fast test runs)
+    ai_backend: Literal["auto", "dummy"] = Field(
+        "auto", validation_alias=AliasChoices("ai_backend", "cst_ai_backend")
+    )
 
     # Dataset integration configuration
     # Hugging Face dataset
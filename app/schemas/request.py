@@ -5,7 +5,7 @@ Uses Pydantic v2 for robust validation and serialization.
 
 from typing import Optional
 
-from pydantic import BaseModel, Field, field_validator, model_validator
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 
 class TicketCreateRequest(BaseModel):
@@ -58,16 +58,6 @@ class TicketCreateRequest(BaseModel):
 
         return self
 
-    @field_validator("body", mode="after")
-    @classmethod
-    def validate_body_length(cls, body: Optional[str]) -> Optional[str]:
-        """Ensure body has meaningful content if provided."""
-        if body and len(body.strip()) < 10:
-            raise ValueError(
-                "Body must contain at least 10 characters of meaningful " "content"
-            )
-        return body
-
     def get_full_text(self) -> str:
         """
         Get the complete text for AI processing.
@@ -108,8 +98,12 @@ class TicketCreateRequest(BaseModel):
 
         return self.body or ""
 
-    model_config = {
-        "json_schema_extra": {
+    # Strings are stripped before length checks, so whitespace-padded text
+    # or body fails min_length; unknown fields are rejected outright
+    model_config = ConfigDict(
+        str_strip_whitespace=True,
+        extra="forbid",
+        json_schema_extra={
             "examples": [
                 {
                     "text": (
@@ -121,8 +115,8 @@ class TicketCreateRequest(BaseModel):
                     "body": ("I was overcharged on my last invoice. Please review."),
                 },
             ]
-        }
-    }
+        },
+    )
 
 
 class TicketFilterParams(BaseModel):
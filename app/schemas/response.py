@@ -25,7 +25,11 @@ class ClassificationResponse(BaseModel):
         None, description="Processing time in milliseconds"
     )
 
-    model_config = {"from_attributes": True, "protected_namespaces": ()}
+    model_config = {
+        "from_attributes": True,
+        "frozen": True,
+        "protected_namespaces": (),
+    }
 
 
 class TicketResponse(BaseModel):
@@ -55,10 +55,11 @@ class ClassificationResult(BaseModel):
 
     Note:
         The model_config disables Pydantic's protected namespace warnings
-        for the 'model_name' field to avoid conflicts with Pydantic internals.
+        for the 'model_name' field to avoid conflicts with Pydantic internals,
+        and freezes results so they cannot be modified after classification.
     """
 
-    model_config = {"protected_namespaces": ()}
+    model_config = {"frozen": True, "protected_namespaces": ()}
 
     category: str  # Primary classification category
     confidence_score: float  # Classification confidence (0.0-1.0)
@@ -106,7 +107,8 @@ class BaseClassifier(ABC):
         """
         pass
 
-    def map_queue_to_category(self, queue: str) -> str:
+    @staticmethod
+    def map_queue_to_category(queue: str) -> str:
         """
         Map dataset queue identifiers to standardized categories.
 
@@ -134,7 +136,8 @@ class BaseClassifier(ABC):
         else:
             return "general"
 
-    def map_priority_to_confidence(self, priority: str) -> float:
+    @staticmethod
+    def map_priority_to_confidence(priority: str) -> float:
         """
         Convert priority levels to confidence scores.
 
@@ -362,11 +365,15 @@ class DummyClassifier(BaseClassifier):
         text_lower = text.lower()
 
         # Simple keyword-based classification
-        if any(word in text_lower for word in ["crash", "error", "bug", "technical"]):
+        if any(
+            word in text_lower
+            for word in ["crash", "error", "bug", "technical", "server", "database"]
+        ):
             category = "technical"
             confidence = 0.8
         elif any(
-            word in text_lower for word in ["invoice", "billing", "payment", "charge"]
+            word in text_lower
+            for word in ["invoice", "billing", "payment", "charge", "refund"]
         ):
             category = "billing"
             confidence = 0.85
@@ -392,7 +399,11 @@ def get_classifier() -> BaseClassifier:
     """
     Factory function to get appropriate classifier.
     Returns OpenAI classifier if configured, otherwise dummy.
+    Setting CST_AI_BACKEND=dummy always selects the dummy classifier.
     """
+    if settings.ai_backend == "dummy":
+        return DummyClassifier()
+
     if settings.openai_api_key and settings.openai_api_key.strip():
         try:
             return OpenAIClassifier()
@@ -13,7 +13,7 @@ from sqlalchemy.orm import selectinload
 from app.models.classification import Classification
 from app.models.ticket import Ticket
 from app.schemas.request import TicketCreateRequest, TicketFilterParams
-from app.services.ai_classifier import get_classifier
+from app.services.ai_classifier import BaseClassifier, get_classifier
 
 
 def map_queue_to_category(queue: str) -> str:
@@ -64,9 +64,9 @@ def map_priority_to_confidence(priority: str) -> float:
 class TicketService:
     """Service for managing support tickets."""
 
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, classifier: Optional[BaseClassifier] = None):
         self.db = db
-        self.classifier = get_classifier()
+        self.classifier = classifier if classifier is not None else get_classifier()
 
     async def create_ticket(self, request: TicketCreateRequest) -> Ticket:
         """
@@ -0,0 +1,227 @@
+"""
+Shared pytest fixtures for the test suite.
+Provides a session-wide test database wired into the FastAPI app, with
+each test isolated in a transaction that is rolled back afterwards.
+"""
+
+import asyncio
+import json
+from contextlib import asynccontextmanager, contextmanager
+from functools import lru_cache, partial
+
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+from pytest_asyncio import is_async_test
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base, get_db
+from app.main import app
+from app.services import ai_classifier
+from app.services.ai_classifier import DummyClassifier, get_classifier
+
+# Test database setup - in-memory SQLite with async support, so the suite
+# never touches disk. The memory DB only lives as long as its connection,
+# hence StaticPool below to share one connection across all sessions.
+# Each pytest-xdist worker gets its own named database ("master" without -n).
+SQLALCHEMY_DATABASE_URL = (
+    "sqlite+aiosqlite:///file:memdb_{worker_id}?mode=memory&cache=shared&uri=true"
+)
+
+
+def pytest_collection_modifyitems(items):
+    """Run every async test in the session-scoped event loop."""
+    session_scope_marker = pytest.mark.asyncio(scope="session")
+    for item in items:
+        if is_async_test(item):
+            item.add_marker(session_scope_marker, append=False)
+
+
+@pytest_asyncio.fixture(scope="session")
+async def test_engine(request):
+    """Create the test database schema once for the whole session."""
+    worker_id = getattr(request.config, "workerinput", {}).get("workerid", "master")
+    engine = create_async_engine(
+        SQLALCHEMY_DATABASE_URL.format(worker_id=worker_id),
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False, "uri": True},
+    )
+
+    # Let SQLAlchemy emit BEGIN itself so SAVEPOINTs work with pysqlite,
+    # and apply connection PRAGMAs once for the single pooled connection
+    @event.listens_for(engine.sync_engine, "connect")
+    def do_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-64000")
+        cursor.close()
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def do_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@contextmanager
+def _override_get_db(override):
+    """Route the app's database dependency to ``override`` within the block."""
+    previous_override = app.dependency_overrides.get(get_db)
+    app.dependency_overrides[get_db] = override
+    try:
+        yield
+    finally:
+        if previous_override is None:
+            app.dependency_overrides.pop(get_db, None)
+        else:
+            app.dependency_overrides[get_db] = previous_override
+
+
+@asynccontextmanager
+async def _rolled_back_session_local(engine):
+    """
+    Yield a session factory wired into the app whose writes are discarded.
+
+    All sessions share one connection inside an outer transaction, and
+    their commits only release SAVEPOINTs, so everything written in the
+    scope is rolled back on exit instead of persisting to the database.
+    Request sessions take turns on that connection, so concurrent requests
+    (e.g. via asyncio.gather) cannot interleave their SAVEPOINTs.
+    """
+    connection = await engine.connect()
+    transaction = await connection.begin()
+    session_local = async_sessionmaker(
+        bind=connection,
+        autocommit=False,
+        autoflush=False,
+        expire_on_commit=False,
+        class_=AsyncSession,
+        join_transaction_mode="create_savepoint",
+    )
+
+    connection_lock = asyncio.Lock()
+
+    async def override_get_db():
+        """Override database dependency for testing."""
+        async with connection_lock, session_local() as session:
+            try:
+                yield session
+            finally:
+                await session.close()
+
+    try:
+        with _override_get_db(override_get_db):
+            yield session_local
+    finally:
+        await transaction.rollback()
+        await connection.close()
+
+
+@pytest.fixture(scope="session")
+def rolled_back_session_local(test_engine):
+    """Open a rolled-back, app-wired database scope from any fixture scope."""
+    return partial(_rolled_back_session_local, test_engine)
+
+
+@pytest_asyncio.fixture
+async def testing_session_local(rolled_back_session_local):
+    """Per-test session factory wired into the app, rolled back on teardown."""
+    async with rolled_back_session_local() as session_local:
+        yield session_local
+
+
+@pytest_asyncio.fixture
+async def db(testing_session_local):
+    """Database session for the current test, rolled back on teardown."""
+    async with testing_session_local() as session:
+        yield session
+
+
+@pytest_asyncio.fixture(scope="session")
+async def client():
+    """Async HTTP client calling the FastAPI app in-process over ASGI."""
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        yield client
+
+
+@pytest_asyncio.fixture(scope="session")
+async def ticket_factory(test_engine, client):
+    """
+    Create tickets through the API once per session, memoized by payload.
+
+    These tickets are committed so they outlive the per-test transactions;
+    call the factory from module- or class-scoped fixtures, which are set
+    up before a test opens its own transaction.
+    """
+    session_local = async_sessionmaker(
+        bind=test_engine, class_=AsyncSession, expire_on_commit=False
+    )
+    ticket_ids = {}
+
+    async def override_get_db():
+        """Override database dependency with committing sessions."""
+        async with session_local() as session:
+            yield session
+
+    async def create_ticket(payload):
+        key = json.dumps(payload, sort_keys=True)
+        if key not in ticket_ids:
+            with _override_get_db(override_get_db):
+                response = await client.post("/api/v1/requests/", json=payload)
+            assert response.status_code == 201
+            ticket_ids[key] = response.json()["id"]
+        return ticket_ids[key]
+
+    return create_ticket
+
+
+@pytest.fixture(scope="session", autouse=True)
+def stub_classifier():
+    """Classify tickets with the app's DummyClassifier instead of the AI API."""
+    app.dependency_overrides[get_classifier] = DummyClassifier
+    yield
+    app.dependency_overrides.pop(get_classifier, None)
+
+
+@pytest.fixture(autouse=True)
+def real_classifier(request, stub_classifier):
+    """Use the configured AI classifier for tests marked ``ai``."""
+    if request.node.get_closest_marker("ai") is None:
+        yield
+        return
+    app.dependency_overrides.pop(get_classifier, None)
+    yield
+    app.dependency_overrides[get_classifier] = DummyClassifier
+
+
+@pytest.fixture(scope="session")
+def ai():
+    """The ai_classifier module, so tests reach its names through one handle."""
+    return ai_classifier
+
+
+@pytest.fixture(scope="session")
+def classifier(ai):
+    """Dummy classifier shared by every test in the session (per xdist worker)."""
+    classifier = ai.DummyClassifier()
+    # Memoize the pure mapping lookups on this instance
+    classifier.map_queue_to_category = lru_cache(maxsize=16)(
+        classifier.map_queue_to_category
+    )
+    classifier.map_priority_to_confidence = lru_cache(maxsize=16)(
+        classifier.map_priority_to_confidence
+    )
+    return classifier
@@ -3,9 +3,13 @@ Basic API tests for the customer support system.
 Uses requests to test against running server.
 """
 
+import pytest
 import requests
 from time import sleep
 
+# Needs a live server on localhost:8000; excluded by default, run with -m e2e
+pytestmark = pytest.mark.e2e
+
 
 class TestHealthEndpoints:
     """Test health check endpoints."""
@@ -25,8 +29,9 @@ class TestHealthEndpoints:
         response = requests.get(f"{self.BASE_URL}/health")
         assert response.status_code == 200
         data = response.json()
-        assert "status" in data
+        assert data["status"] == "healthy"
         assert "services" in data
+        assert data["services"]["database"] == "healthy"
 
 
 class TestRequestEndpoints:
@@ -3,8 +3,15 @@ Dataset validation tests using real Hugging Face dataset samples.
 Tests classification accuracy against ground truth labels.
 """
 
-import pytest
+import functools
+import itertools
+import logging
+import os
+import re
 import warnings
+from pathlib import Path
+
+import pytest
 
 # Suppress fsspec deprecation warning from datasets library
 warnings.filterwarnings(
@@ -16,15 +23,113 @@ warnings.filterwarnings(
 
 # Import dataset library
 try:
-    from datasets import load_dataset
+    import numpy as np
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    from datasets import Dataset, load_dataset
 
     DATASETS_AVAILABLE = True
 except ImportError:
     DATASETS_AVAILABLE = False
 
+from app.config import settings
 from app.services.ai_classifier import get_classifier
 from app.services.ai_classifier import DummyClassifier
 
+logger = logging.getLogger(__name__)
+
+# Number of leading dataset rows the tests run against
+SAMPLE_SIZE = 100
+
+# Arrow IPC snapshot of the sampled rows, memory-mapped on later runs. Keyed
+# on dataset and sample size, and anchored at the project root rather than
+# the working directory.
+SNAPSHOT_PATH = (
+    Path(__file__).resolve().parents[1]
+    / settings.dataset_cache_dir
+    / f"{settings.dataset_name.replace('/', '__')}-{SAMPLE_SIZE}.arrow"
+)
+
+# Case-insensitive queue patterns, compiled once instead of lowering each row
+_TECH_RE = re.compile(r"technical|it support", re.IGNORECASE)
+_BILL_RE = re.compile(r"billing|payment", re.IGNORECASE)
+
+
+# Queue and priority values have very low cardinality across dataset rows,
+# so memoize the mapping lookups instead of re-processing each string.
+@functools.lru_cache(maxsize=64)
+def _q2c(queue: str) -> str:
+    """Cached queue to category mapping."""
+    return DummyClassifier.map_queue_to_category(queue)
+
+
+@functools.lru_cache(maxsize=64)
+def _p2c(priority: str) -> float:
+    """Cached priority to confidence mapping."""
+    return DummyClassifier.map_priority_to_confidence(priority)
+
+
+@functools.lru_cache(maxsize=64)
+def _queue_mapping_ok(queue: str) -> int:
+    """Return 1 if the queue maps to a reasonable category, else 0."""
+    mapped_category = _q2c(queue)
+
+    if _TECH_RE.search(queue) and mapped_category == "technical":
+        return 1
+    elif _BILL_RE.search(queue) and mapped_category == "billing":
+        return 1
+    elif mapped_category == "general":  # Default case
+        return 1
+    return 0
+
+
+def _load_samples():
+    """
+    Load the first SAMPLE_SIZE dataset rows, reusing a local Arrow snapshot.
+
+    The snapshot is memory-mapped, so tests only page in the columns they
+    actually touch and warm runs skip the download entirely. A snapshot
+    that cannot be read is an error, not a reason to skip.
+    """
+    if SNAPSHOT_PATH.exists():
+        # The table's buffers keep the mapping alive after the file closes
+        with pa.memory_map(str(SNAPSHOT_PATH)) as source:
+            return Dataset(pa.ipc.open_file(source).read_all())
+
+    # Stream the split so memory stays flat regardless of its size,
+    # then materialize just the sampled rows for the assertions.
+    # Larger future tests should consume the stream directly instead.
+    try:
+        stream = load_dataset(settings.dataset_name, split="train", streaming=True)
+        dataset = Dataset.from_list(
+            list(itertools.islice(stream, SAMPLE_SIZE)), features=stream.features
+        )
+    except Exception as e:
+        pytest.skip(f"Could not load dataset: {e}")
+
+    # Write to a temporary file and rename it into place, so concurrent
+    # workers never see a partial snapshot and an interrupted run leaves none.
+    # The per-process name lets open(..., "xb") create it with the usual
+    # umask-derived mode.
+    SNAPSHOT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = SNAPSHOT_PATH.with_name(f"{SNAPSHOT_PATH.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "xb") as sink:
+            with pa.ipc.new_file(sink, dataset.data.schema) as writer:
+                writer.write_table(dataset.data.table)
+        os.replace(tmp_path, SNAPSHOT_PATH)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    return dataset
+
+
+@pytest.fixture
+def ai_classifier():
+    """Classifier instance used for realistic example tests."""
+    return get_classifier()
+
 
 @pytest.mark.skipif(not DATASETS_AVAILABLE, reason="datasets library not available")
 class TestDatasetValidation:
@@ -33,14 +138,17 @@ class TestDatasetValidation:
     @classmethod
     def setup_class(cls):
         """Load dataset samples for testing."""
-        try:
-            # Load a small subset of the dataset for testing
-            dataset = load_dataset(
-                "tobi-bueck/customer-support-tickets", split="train[:100]"
-            )
-            cls.dataset_samples = dataset
-        except Exception as e:
-            pytest.skip(f"Could not load dataset: {e}")
+        dataset = _load_samples()
+        cls.dataset_samples = dataset
+
+        # Narrow column views so each test only materializes what it reads
+        cls.queue_ds = dataset.select_columns(["queue"])
+        cls.pri_ds = dataset.select_columns(["priority"])
+        cls.lang_ds = dataset.select_columns(["language"])
+        cls.tag_ds = dataset.select_columns(
+            [c for c in dataset.column_names if c.startswith("tag_")]
+        )
+        cls.text_ds = dataset.select_columns(["subject", "body", "queue"])
 
     def test_queue_category_mapping_accuracy(self):
         """Test that queue to category mapping works for dataset samples."""
@@ -48,33 +156,12 @@ class TestDatasetValidation:
             pytest.skip("Dataset not loaded")
 
         # Test mapping accuracy on sample data
-        mapping_results = {"correct": 0, "total": 0}
-
-        classifier = DummyClassifier()
-        for sample in self.dataset_samples:
-            queue = sample.get("queue", "")
-            if not queue:
-                continue
-
-            mapped_category = classifier.map_queue_to_category(queue)
-
-            # Verify mapping is reasonable
-            queue_lower = queue.lower()
-            mapping_results["total"] += 1
-
-            if (
-                "technical" in queue_lower or "it support" in queue_lower
-            ) and mapped_category == "technical":
-                mapping_results["correct"] += 1
-            elif (
-                "billing" in queue_lower or "payment" in queue_lower
-            ) and mapped_category == "billing":
-                mapping_results["correct"] += 1
-            elif mapped_category == "general":  # Default case
-                mapping_results["correct"] += 1
-
-        if mapping_results["total"] > 0:
-            accuracy = mapping_results["correct"] / mapping_results["total"]
+        results = [_queue_mapping_ok(q) for q in self.queue_ds["queue"] if q]
+        correct = sum(results)
+        total = len(results)
+
+        if total > 0:
+            accuracy = correct / total
             assert accuracy >= 0.7, f"Queue mapping accuracy too low: {accuracy:.2f}"
 
     def test_priority_confidence_mapping(self):
@@ -82,35 +169,27 @@ class TestDatasetValidation:
         if not hasattr(self, "dataset_samples"):
             pytest.skip("Dataset not loaded")
 
-        confidence_ranges = {"critical": [], "medium": [], "low": []}
-        classifier = DummyClassifier()
-
-        for sample in self.dataset_samples:
-            priority = sample.get("priority", "")
-            if not priority:
-                continue
-
-            confidence = classifier.map_priority_to_confidence(priority)
-            priority_lower = priority.lower()
+        priorities = self.pri_ds.to_pandas()["priority"].fillna("")
+        priorities = priorities[priorities != ""]
 
-            if "critical" in priority_lower:
-                confidence_ranges["critical"].append(confidence)
-            elif "medium" in priority_lower:
-                confidence_ranges["medium"].append(confidence)
-            elif "low" in priority_lower:
-                confidence_ranges["low"].append(confidence)
+        # Bucket and average confidences with vectorized masks instead of a
+        # per-row branch ladder
+        confidence = priorities.map(_p2c).to_numpy(dtype=float)
+        lowered = np.char.lower(priorities.to_numpy(dtype=str))
+        crit_mask = np.char.find(lowered, "critical") >= 0
+        med_mask = ~crit_mask & (np.char.find(lowered, "medium") >= 0)
+        low_mask = ~crit_mask & ~med_mask & (np.char.find(lowered, "low") >= 0)
 
         # Verify confidence ordering
-        if confidence_ranges["critical"]:
-            avg_critical = sum(confidence_ranges["critical"]) / len(
-                confidence_ranges["critical"]
-            )
+        if crit_mask.any():
+            avg_critical = confidence[crit_mask].mean()
             assert avg_critical >= 0.8, "Critical priority should have high confidence"
 
-        if confidence_ranges["low"]:
-            avg_low = sum(confidence_ranges["low"]) / len(confidence_ranges["low"])
+        if low_mask.any():
+            avg_low = confidence[low_mask].mean()
             assert avg_low <= 0.7, "Low priority should have lower confidence"
 
+    @pytest.mark.slow
     @pytest.mark.asyncio
     async def test_ai_classification_on_dataset_samples(self):
         """Test AI classifier on real dataset samples."""
@@ -121,29 +200,26 @@ class TestDatasetValidation:
 
         # Test on a few representative samples
         # Test on first 10 samples
-        test_samples = list(self.dataset_samples)[:10]
+        table = self.text_ds.with_format("arrow")[:10]
+
+        # Build full text like the application does in one Arrow kernel call;
+        # missing parts become empty and stray separators are trimmed off
+        full = pc.utf8_trim_whitespace(
+            pc.binary_join_element_wise(
+                pc.coalesce(table.column("subject"), ""),
+                pc.coalesce(table.column("body"), ""),
+                "\n\n",
+            )
+        )
 
-        classification_results = []
+        # Skip very short texts
+        mask = pc.greater_equal(pc.utf8_length(full), 10)
+        texts = full.filter(mask).to_pylist()
+        queues = table.column("queue").filter(mask).to_pylist()
 
-        for sample in test_samples:
-            subject = sample.get("subject", "")
-            body = sample.get("body", "")
-            queue = sample.get("queue", "")
-
-            # Create full text like the application does
-            if subject and body:
-                full_text = f"{subject}\n\n{body}"
-            elif body:
-                full_text = body
-            elif subject:
-                full_text = subject
-            else:
-                continue
-
-            # Skip very short texts
-            if len(full_text.strip()) < 10:
-                continue
+        classification_results = []
 
+        for full_text, queue in zip(texts, queues):
             # Classify
             result = await classifier.classify(full_text)
 
@@ -154,12 +230,15 @@ class TestDatasetValidation:
             assert 0.0 <= result.confidence_score <= 1.0
 
             # Store for analysis
-            expected_category = (
-                classifier.map_queue_to_category(queue) if queue else "general"
+            expected_category = _q2c(queue) if queue else "general"
+            logger.debug(
+                "Sample %.100r: expected=%s actual=%s",
+                full_text,
+                expected_category,
+                result.category,
             )
             classification_results.append(
                 {
-                    "text": full_text[:100],
                     "expected": expected_category,
                     "actual": result.category,
                     "confidence": result.confidence_score,
@@ -172,11 +251,13 @@ class TestDatasetValidation:
             matches = sum(1 for r in classification_results if r["match"])
             accuracy = matches / len(classification_results)
 
-            # Print results for debugging
-            print("\nClassification Results:")
-            print(f"Total samples: {len(classification_results)}")
-            print(f"Correct: {matches}")
-            print(f"Accuracy: {accuracy:.2f}")
+            # Log the results for debugging
+            logger.debug(
+                "Classification results: total=%d correct=%d accuracy=%.2f",
+                len(classification_results),
+                matches,
+                accuracy,
+            )
 
             # We expect some accuracy, but allow for model differences
             assert accuracy >= 0.3, f"Classification accuracy too low: {accuracy:.2f}"
@@ -189,15 +270,15 @@ class TestDatasetValidation:
         english_samples = []
         non_english_samples = []
 
-        for sample in self.dataset_samples:
+        for sample in self.lang_ds:
             language = sample.get("language", "").lower()
             if language == "en" or language == "english":
                 english_samples.append(sample)
             elif language and language not in ["en", "english"]:
                 non_english_samples.append(sample)
 
-        print(f"English samples: {len(english_samples)}")
-        print(f"Non-English samples: {len(non_english_samples)}")
+        logger.debug("English samples: %d", len(english_samples))
+        logger.debug("Non-English samples: %d", len(non_english_samples))
 
         # Most samples should be English as per requirements
         if english_samples or non_english_samples:
@@ -213,14 +294,14 @@ class TestDatasetValidation:
         tag_columns_found = set()
         sample_with_tags = None
 
-        for sample in self.dataset_samples:
+        for sample in self.tag_ds:
             for key in sample.keys():
                 if key.startswith("tag_") and key[4:].isdigit():
                     tag_columns_found.add(key)
                     if sample[key] and sample[key].strip():
                         sample_with_tags = sample
 
-        print(f"Tag columns found: {sorted(tag_columns_found)}")
+        logger.debug("Tag columns found: %s", sorted(tag_columns_found))
 
         # Should have tag_1 through tag_8
         expected_tags = {f"tag_{i}" for i in range(1, 9)}
@@ -229,7 +310,7 @@ class TestDatasetValidation:
         ), f"Missing tag columns: {expected_tags - tag_columns_found}"
 
         if sample_with_tags:
-            print(f"Sample with tags: {sample_with_tags}")
+            logger.debug("Sample with tags: %s", sample_with_tags)
 
 
 class TestDatasetIntegration:
@@ -278,14 +359,12 @@ class TestDatasetIntegration:
         # Verify mock record has all expected fields
         assert set(mock_record.keys()) == expected_fields
 
-        classifier = DummyClassifier()
-
         # Test queue mapping
-        category = classifier.map_queue_to_category(mock_record["queue"])
+        category = DummyClassifier.map_queue_to_category(mock_record["queue"])
         assert category == "technical"
 
         # Test priority mapping
-        confidence = classifier.map_priority_to_confidence(mock_record["priority"])
+        confidence = DummyClassifier.map_priority_to_confidence(mock_record["priority"])
         assert confidence == 0.7
 
         # Test tag extraction
@@ -298,66 +377,62 @@ class TestDatasetIntegration:
         assert len(tags) == 2
         assert ("server", "performance") == (tags[0][1], tags[1][1])
 
-    @pytest.mark.asyncio
-    async def test_realistic_ticket_examples(self):
-        """Test classification on realistic ticket examples."""
-        classifier = get_classifier()
-
-        realistic_examples = [
-            {
-                "subject": "Database Connection Issues",
-                "body": (
+    @pytest.mark.parametrize(
+        "subject,body,expected",
+        [
+            (
+                "Database Connection Issues",
+                (
                     "Our production database server is experiencing "
                     "intermittent connection timeouts. The application shows "
                     "error messages about unable to connect to PostgreSQL "
                     "server. This started happening after the recent system "
                     "update. Please investigate urgently."
                 ),
-                "expected_category": "technical",
-            },
-            {
-                "subject": "Billing Discrepancy",
-                "body": (
+                "technical",
+            ),
+            (
+                "Billing Discrepancy",
+                (
                     "I noticed that my account was charged $299 this month "
                     "instead of the usual $199 subscription fee. I haven't "
                     "made any changes to my plan or added any additional "
                     "services. Could you please review my account and process "
                     "a refund for the difference?"
                 ),
-                "expected_category": "billing",
-            },
-            {
-                "subject": "Product Information Request",
-                "body": (
+                "billing",
+            ),
+            (
+                "Product Information Request",
+                (
                     "I'm evaluating your software for our company and would "
                     "like to understand what features are included in the "
                     "enterprise tier. Specifically, I'm interested in user "
                     "management capabilities, API access, and integration "
                     "options with third-party tools."
                 ),
-                "expected_category": "general",
-            },
-        ]
-
-        correct_classifications = 0
-
-        for example in realistic_examples:
-            full_text = f"{example['subject']}\n\n{example['body']}"
-            result = await classifier.classify(full_text)
-
-            print(f"\nText: {example['subject']}")
-            print(f"Expected: {example['expected_category']}")
-            print(f"Actual: {result.category}")
-            print(f"Confidence: {result.confidence_score}")
-
-            if result.category == example["expected_category"]:
-                correct_classifications += 1
+                "general",
+            ),
+        ],
+        ids=["technical", "billing", "general"],
+    )
+    @pytest.mark.slow
+    @pytest.mark.asyncio
+    async def test_realistic_ticket_examples(
+        self, ai_classifier, subject, body, expected
+    ):
+        """Test classification on realistic ticket examples."""
+        result = await ai_classifier.classify(f"{subject}\n\n{body}")
 
-        accuracy = correct_classifications / len(realistic_examples)
-        print(f"\nRealistic examples accuracy: {accuracy:.2f}")
+        logger.debug(
+            "Text: %s expected=%s actual=%s confidence=%s",
+            subject,
+            expected,
+            result.category,
+            result.confidence_score,
+        )
 
-        # Should get most examples right (allow some flexibility)
-        assert accuracy >= 0.5, f"Accuracy too low on realistic examples: {accuracy}"
+        assert result.category == expected
 
 
 if __name__ == "__main__":
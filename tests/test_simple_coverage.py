@@ -1,140 +1,189 @@
 """
 Simple tests to demonstrate code coverage improvement.
 Tests core functionality without complex async database setup.
+
+The asserts here are simple enough without pytest's assertion rewriting,
+so the module opts out of it: PYTEST_DONT_REWRITE
 """
 
+import sys
+
 import pytest
-from unittest.mock import patch
-
-from app.services.ai_classifier import DummyClassifier, get_classifier
+from pydantic import ValidationError
+
+from app.config import Settings
+from app.schemas.request import TicketCreateRequest
+from app.schemas.response import ClassificationResponse
+
+# Valid classification fields accepted by both the service result and the
+# API response schema
+CLASSIFICATION_FIELDS = {
+    "category": "technical",
+    "confidence_score": 0.85,
+    "summary": "Test summary",
+    "processing_time_ms": 150,
+    "model_name": "test-model",
+}
+
+# Expected dataset mapping tables: (queue, category) and (priority, confidence)
+QUEUE_CASES = (
+    ("Technical Support", "technical"),
+    ("IT Support", "technical"),
+    ("Billing and Payments", "billing"),
+    ("Customer Service", "general"),
+    ("General Inquiries", "general"),
+    ("Unknown", "general"),
+    ("", "general"),
+)
+PRIORITY_CASES = (
+    ("Critical", 0.9),
+    ("Medium", 0.7),
+    ("Low", 0.5),
+    ("Unknown", 0.7),
+)
+
+
+def _in_unit(value):
+    """Check that a score lies within the closed interval [0, 1]."""
+    return 0.0 <= value <= 1.0
+
+
+# Classifier behaviour
+
+
+@pytest.mark.parametrize(
+    "text,expected_category",
+    [
+        ("Server technical error", "technical"),
+        ("Invoice billing problem", "billing"),
+        ("General information request", "general"),
+    ],
+    ids=["technical", "billing", "general"],
+)
+async def test_dummy_classifier(classifier, text, expected_category):
+    """Test dummy classifier keyword classification."""
+    result = await classifier.classify(text)
+    assert result.category == expected_category
+    assert _in_unit(result.confidence_score)
+    assert result.model_name == "dummy-classifier"
+
+
+@pytest.fixture(params=[None, "", "   "], ids=["none", "empty", "blank"])
+def no_key(request, ai, monkeypatch):
+    """ai_classifier module with the OpenAI key unset, once per missing-key form."""
+    monkeypatch.setattr(ai.settings, "openai_api_key", request.param)
+    return ai
+
+
+def test_get_classifier_without_key(no_key):
+    """Test get_classifier returns dummy when no OpenAI key."""
+    classifier = no_key.get_classifier()
+    assert type(classifier) is no_key.DummyClassifier
+
+
+def test_get_classifier_dummy_backend_with_key(ai, monkeypatch):
+    """Test the dummy backend wins over a configured OpenAI key."""
+    monkeypatch.setattr(ai.settings, "openai_api_key", "sk-test")
+    monkeypatch.setattr(ai.settings, "ai_backend", "dummy")
+    assert type(ai.get_classifier()) is ai.DummyClassifier
+
+
+def test_ai_backend_setting_validation(monkeypatch):
+    """Test the classifier backend setting by name, env var and typo."""
+    assert Settings(ai_backend="dummy").ai_backend == "dummy"
+
+    monkeypatch.setenv("CST_AI_BACKEND", "dummy")
+    assert Settings().ai_backend == "dummy"
+
+    with pytest.raises(ValidationError):
+        Settings(ai_backend="dumy")
+
+
+@pytest.mark.parametrize(
+    "queue,category",
+    QUEUE_CASES,
+    ids=[queue or "empty" for queue, _ in QUEUE_CASES],
+)
+def test_queue_to_category_mapping(classifier, queue, category):
+    """Test queue to category mapping."""
+    assert classifier.map_queue_to_category(queue) == category
+
+
+@pytest.mark.parametrize(
+    "priority,confidence",
+    PRIORITY_CASES,
+    ids=[priority for priority, _ in PRIORITY_CASES],
+)
+def test_priority_to_confidence_mapping(classifier, priority, confidence):
+    """Test priority to confidence mapping."""
+    # Cast so the exact comparison is a plain float one even for numpy scalars
+    assert float(classifier.map_priority_to_confidence(priority)) == confidence
+
+
+# Pydantic schema validation
+
+
+def test_classification_result_validation(ai):
+    """Test classification result validation."""
+    # Valid result
+    result = ai.ClassificationResult(**CLASSIFICATION_FIELDS)
+
+    assert result.category == "technical"
+    assert result.confidence_score == 0.85
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {"text": "This is a test ticket with enough length"},
+        {"subject": "Test Subject", "body": "This is a test body with enough length"},
+    ],
+    ids=["text", "subject_body"],
+)
+def test_request_schema_validation(payload):
+    """Test request schema validation."""
+    request = TicketCreateRequest(**payload)
+    for field, value in payload.items():
+        assert getattr(request, field) == value
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {"body": "  short     "},
+        {"text": "This is a test ticket with enough length", "priority": "high"},
+    ],
+    ids=["padded_short_body", "unknown_field"],
+)
+def test_request_schema_rejects_invalid(payload):
+    """Test that padding cannot satisfy min_length and unknown keys fail."""
+    with pytest.raises(ValidationError):
+        TicketCreateRequest(**payload)
+
+
+def test_response_schema_validation():
+    """Test response schema validation."""
+    response = ClassificationResponse(**CLASSIFICATION_FIELDS)
+
+    assert response.category == "technical"
+    assert _in_unit(response.confidence_score)
+
 
+@pytest.mark.parametrize(
+    "model_name", ["ClassificationResult", "ClassificationResponse"]
+)
+def test_classification_models_are_frozen(ai, model_name):
+    """Test that classification results cannot be mutated after creation."""
+    models = {
+        "ClassificationResult": ai.ClassificationResult,
+        "ClassificationResponse": ClassificationResponse,
+    }
+    result = models[model_name](**CLASSIFICATION_FIELDS)
 
-class TestBasicFunctionality:
-    """Test basic functionality to demonstrate coverage."""
-
-    @pytest.mark.asyncio
-    async def test_dummy_classifier_basic(self):
-        """Test basic dummy classifier functionality."""
-        classifier = DummyClassifier()
-
-        result = await classifier.classify("Server technical error")
-        assert result.category == "technical"
-        assert 0.0 <= result.confidence_score <= 1.0
-        assert result.model_name == "dummy-classifier"
-
-    @pytest.mark.asyncio
-    async def test_dummy_classifier_billing(self):
-        """Test billing classification."""
-        classifier = DummyClassifier()
-
-        result = await classifier.classify("Invoice billing problem")
-        assert result.category == "billing"
-        assert 0.0 <= result.confidence_score <= 1.0
-
-    @pytest.mark.asyncio
-    async def test_dummy_classifier_general(self):
-        """Test general classification."""
-        classifier = DummyClassifier()
-
-        result = await classifier.classify("General information request")
-        assert result.category == "general"
-        assert 0.0 <= result.confidence_score <= 1.0
-
-    def test_get_classifier_without_key(self):
-        """Test get_classifier returns dummy when no OpenAI key."""
-        with patch("app.services.ai_classifier.settings") as mock_settings:
-            mock_settings.openai_api_key = None
-            classifier = get_classifier()
-            assert isinstance(classifier, DummyClassifier)
-
-    def test_queue_to_category_mapping(self):
-        """Test queue to category mapping."""
-        classifier = DummyClassifier()
-
-        assert classifier.map_queue_to_category("Technical Support") == "technical"
-        assert classifier.map_queue_to_category("IT Support") == "technical"
-        assert classifier.map_queue_to_category("Billing and Payments") == "billing"
-        assert classifier.map_queue_to_category("Customer Service") == "general"
-        assert classifier.map_queue_to_category("Unknown") == "general"
-
-    def test_priority_to_confidence_mapping(self):
-        """Test priority to confidence mapping."""
-        classifier = DummyClassifier()
-
-        assert classifier.map_priority_to_confidence("Critical") == 0.9
-        assert classifier.map_priority_to_confidence("Medium") == 0.7
-        assert classifier.map_priority_to_confidence("Low") == 0.5
-        assert classifier.map_priority_to_confidence("Unknown") == 0.7
-
-
-class TestTicketServiceFunctions:
-    """Test ticket service utility functions."""
-
-    def test_service_mapping_functions(self):
-        """Test service-level mapping functions."""
-        classifier = DummyClassifier()
-
-        # Test queue mappings
-        assert classifier.map_queue_to_category("Technical Support") == "technical"
-        assert classifier.map_queue_to_category("Billing and Payments") == "billing"
-        assert classifier.map_queue_to_category("General Inquiries") == "general"
-        assert classifier.map_queue_to_category("") == "general"
-
-        # Test priority mappings
-        assert classifier.map_priority_to_confidence("Critical") == 0.9
-        assert classifier.map_priority_to_confidence("Medium") == 0.7
-        assert classifier.map_priority_to_confidence("Low") == 0.5
-
-
-class TestSchemaValidation:
-    """Test Pydantic schema validation."""
-
-    def test_classification_result_validation(self):
-        """Test classification result validation."""
-        from app.services.ai_classifier import ClassificationResult
-
-        # Valid result
-        result = ClassificationResult(
-            category="technical",
-            confidence_score=0.85,
-            summary="Test summary",
-            processing_time_ms=150,
-            model_name="test-model",
-        )
-
-        assert result.category == "technical"
-        assert result.confidence_score == 0.85
-
-    def test_request_schema_validation(self):
-        """Test request schema validation."""
-        from app.schemas.request import TicketCreateRequest
-
-        # Valid text-only request
-        request = TicketCreateRequest(text="This is a test ticket with enough length")
-        assert request.text == "This is a test ticket with enough length"
-
-        # Valid subject/body request
-        request = TicketCreateRequest(
-            subject="Test Subject", body="This is a test body with enough length"
-        )
-        assert request.subject == "Test Subject"
-        assert request.body == "This is a test body with enough length"
-
-    def test_response_schema_validation(self):
-        """Test response schema validation."""
-        from app.schemas.response import ClassificationResponse
-
-        response = ClassificationResponse(
-            category="technical",
-            confidence_score=0.85,
-            summary="Test summary",
-            model_name="test-model",
-            processing_time_ms=150,
-        )
-
-        assert response.category == "technical"
-        assert 0.0 <= response.confidence_score <= 1.0
+    with pytest.raises(ValidationError):
+        result.category = "billing"
+    assert result.category == "technical"
 
 
 if __name__ == "__main__":
-    pytest.main([__file__, "-v"])
+    sys.exit(pytest.main([__file__, "-v", "-p", "no:cacheprovider"]))